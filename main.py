@@ -1,9 +1,9 @@
-import json
+import asyncio
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
 from base58 import b58decode
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 from dotenv import load_dotenv
@@ -17,6 +17,33 @@ IS_MAINNET = RUN_MAINNET == 0
 # Explicit environment label for Orderly public REST calls
 ORDERLY_ENV = "mainnet" if IS_MAINNET else "testnet"
 
+# Статичные меню: кортежи на уровне модуля, чтобы не пересоздавать
+# списки на каждой итерации главного цикла
+DEX_OPTIONS = (
+    "orderly",
+    "hyperliquid",
+    # *** ADD NEW DEX HERE ***
+)
+
+MAIN_OPTIONS = (
+    "View USDC balances on each DEX",  # 1
+    "View open positions",             # 2
+    "Close positions",                 # 3
+    "Cancel open orders",              # 4
+    "Funding rate arbitrage tools",    # 5
+    "Exit",                            # 6
+)
+
+FR_OPTIONS = (
+    "View rates on all available DEXs",
+    "View top 3 rate differences from all DEXs",
+    "Execute Strategy",
+    "Back to Main Menu",
+)
+
+BACK_OPTIONS = ("Back to Main Menu",)
+CONFIRM_OPTIONS = ("Yes", "No")
+
 # Пути к внутренним модулям
 sys.path.append("src")
 sys.path.append("src/orderly")
@@ -39,6 +66,15 @@ from strategies.funding_rate_arbitrage import FundingRateArbitrage
 
 load_dotenv()
 
+# Один экземпляр на модуль, чтобы его TTL-кэши (funding rates и bulk
+# mark prices) работали между вызовами меню
+orderly_public = OrderlyFundingRates(env=ORDERLY_ENV)
+backpack_public = BackpackFundingRates()
+
+# Hyperliquid-клиенту нужны hl_address/hl_info/hl_exchange — создаётся
+# один раз в секции HYPERLIQUID SETUP ниже
+hyperliquid_public = None
+
 
 def prompt_user(options, prompt: str) -> int:
     """Простое текстовое меню, возвращает выбранный номер (1..n)."""
@@ -60,41 +96,58 @@ def clear_screen():
 
 def get_dex_from_dex_options(choice: int):
     try:
-        return dex_options[choice - 1]
+        return DEX_OPTIONS[choice - 1]
     except IndexError:
         print("Invalid choice, aborting!")
         return None
 
 
-def analyze_funding_rate_arbitrage(option: int):
+async def _fetch_all_dex_rates() -> list:
     """
-    Анализ арбитража по funding rate.
+    Конкурентно забрать funding rates со всех DEX.
 
-    option:
-      1 -> показать все ставки
-      2 -> топ-3 разницы относительно всех DEX
+    Каждый клиент синхронный (requests / SDK), поэтому заворачиваем вызовы
+    в `asyncio.to_thread` и ждём их одним `asyncio.gather` — общее время
+    равно самому медленному запросу, а не сумме всех трёх.
     """
-
-    # Каждый запуск тянем свежие ставки с DEX
-    dex_rates_list = [
-        (
-            "orderly",
-            OrderlyFundingRates(env=ORDERLY_ENV).get_orderly_funding_rates(),
-        ),
-        (
-            "hyperliquid",
-            HyperliquidFundingRates(
-                hl_address,
-                hl_info,
-                hl_exchange,
-            ).get_hyperliquid_funding_rates(),
-        ),
-        (
-            "backpack",
-            BackpackFundingRates().get_backpack_funding_rates(),
-        ),
+    names = [
+        "orderly",
+        "hyperliquid",
+        "backpack",
         # *** ADD NEW DEX HERE ***:
     ]
+    coros = [
+        asyncio.to_thread(orderly_public.get_orderly_funding_rates),
+        asyncio.to_thread(hyperliquid_public.get_hyperliquid_funding_rates),
+        asyncio.to_thread(backpack_public.get_backpack_funding_rates),
+        # *** ADD NEW DEX HERE ***:
+    ]
+    results = await asyncio.gather(*coros)
+    return list(zip(names, results))
+
+
+# Скомпилированная таблица ставок: пользователь обычно смотрит несколько
+# представлений подряд, поэтому держим её в кэше с коротким TTL
+_rates_df_cache = None
+_rates_df_ts = 0.0
+RATES_DF_TTL = float(os.getenv("RATES_DF_TTL", "30"))
+
+
+def _build_rates_df():
+    """
+    Собрать (или вернуть из кэша) таблицу funding rates по всем DEX.
+
+    Возвращает пару (fr_arbitrage, df); кэш живёт RATES_DF_TTL секунд,
+    так что переключение между видами 1/2/3 не тянет данные заново.
+    """
+    global _rates_df_cache, _rates_df_ts
+
+    now = time.monotonic()
+    if _rates_df_cache is not None and now - _rates_df_ts < RATES_DF_TTL:
+        return _rates_df_cache
+
+    # Тянем свежие ставки с DEX (все три — параллельно)
+    dex_rates_list = asyncio.run(_fetch_all_dex_rates())
 
     # Инициализируем стратегию
     fr_arbitrage = FundingRateArbitrage()
@@ -107,79 +160,156 @@ def analyze_funding_rate_arbitrage(option: int):
     compiled_rates = fr_arbitrage.compile_rates()
     df = fr_arbitrage.create_rates_table(compiled_rates)
 
-    if option == 1:
-        fr_arbitrage.display_rates_table(df)
-    elif option == 2:
-        fr_arbitrage.display_top_rates_differences_from_all_DEXs(df)
+    _rates_df_cache = (fr_arbitrage, df)
+    _rates_df_ts = now
+    return _rates_df_cache
 
 
-def market_close_an_asset(dex: str, symbol: str):
-    """Маркет-закрытие позиции по символу на выбранном DEX."""
-    if dex == "orderly":
-        response = client.order.market_close_an_asset(symbol)
-        success = response.get("success") is True
-        if not success:
-            print(response.get("message"))
-        return success
+# Префетч: пока пользователь читает подменю и выбирает пункт, ставки уже
+# тянутся в фоне — I/O прячется за "временем на подумать"
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+_rates_future = None
 
-    elif dex == "hyperliquid":
-        success = hyperliquid_order.market_close_an_asset(symbol)
-        return success
 
-    # * elif ADD NEW DEX HERE
+def _prefetch_rates_df():
+    """Запустить фоновый прогрев кэша таблицы ставок (если ещё не идёт)."""
+    global _rates_future
+    if _rates_future is None or _rates_future.done():
+        _rates_future = _PREFETCH_EXECUTOR.submit(_build_rates_df)
 
+
+# Диспетчеризация видов: O(1) вместо цепочки if/elif
+_DISPLAY_DISPATCH = {
+    1: FundingRateArbitrage.display_rates_table,
+    2: FundingRateArbitrage.display_top_rates_differences_from_all_DEXs,
+}
+
+
+def analyze_funding_rate_arbitrage(option: int):
+    """
+    Анализ арбитража по funding rate.
+
+    option:
+      1 -> показать все ставки
+      2 -> топ-3 разницы относительно всех DEX
+    """
+    global _rates_future
+
+    # Если префетч уже идёт — дождаться его (он прогревает TTL-кэш),
+    # затем обычный путь: кэш свежий -> мгновенно, устарел -> refetch
+    if _rates_future is not None:
+        _rates_future.result()
+        _rates_future = None
+
+    fr_arbitrage, df = _build_rates_df()
+
+    handler = _DISPLAY_DISPATCH.get(option)
+    if handler is not None:
+        handler(fr_arbitrage, df)
+
+
+def _unsupported_dex(dex: str) -> bool:
     print(f"Unsupported DEX: {dex}")
     return False
 
 
-def create_order(dex: str, symbol: str, quantity: float, side: Side):
-    """Создать маркет-ордер на любом поддерживаемом DEX."""
-    if dex == "orderly":
-        order_result = client.order.create_market_order(symbol, quantity, side)
-        success = order_result.get("success") is True
-
-        # Берём mark price из публичного API
-        url = (
-            f"https://testnet-api-evm.orderly.network/v1/public/futures/"
-            f"PERP_{symbol}_USDC"
-        )
-        response = json.loads(requests.request("GET", url).text)
-
-        if success:
-            print_formatted_text(
-                f"Orderly order #{order_result['data']['order_id']} ",
-                "filled ",
-                HTML(
-                    f"<ansigreen>{order_result['data']['order_quantity']}</ansigreen>"
-                ),
-                " at ",
-                HTML(f"<ansigreen>{response['data']['mark_price']}</ansigreen>"),
+def _close_on_orderly(symbol: str) -> bool:
+    response = client.order.market_close_an_asset(symbol)
+    success = response.get("success") is True
+    if not success:
+        print(response.get("message"))
+    return success
+
+
+def _close_on_hyperliquid(symbol: str) -> bool:
+    return hyperliquid_order.market_close_an_asset(symbol)
+
+
+# * ADD NEW DEX HERE
+CLOSE_HANDLERS = {
+    "orderly": _close_on_orderly,
+    "hyperliquid": _close_on_hyperliquid,
+}
+
+
+def market_close_an_asset(dex: str, symbol: str):
+    """Маркет-закрытие позиции по символу на выбранном DEX."""
+    handler = CLOSE_HANDLERS.get(dex)
+    if handler is None:
+        return _unsupported_dex(dex)
+    return handler(symbol)
+
+
+def _order_on_orderly(symbol: str, quantity: float, side: Side) -> bool:
+    order_result = client.order.create_market_order(symbol, quantity, side)
+    success = order_result.get("success") is True
+
+    # Берём mark price из bulk-снапшота (один запрос на все рынки,
+    # с коротким TTL) вместо отдельного GET на каждый символ
+    mark_price = orderly_public.get_all_mark_prices().get(
+        f"PERP_{symbol}_USDC"
+    )
+
+    if success:
+        # Одна HTML-строка — один парс разметки и один flush
+        print_formatted_text(
+            HTML(
+                f"Orderly order #{order_result['data']['order_id']} filled "
+                f"<ansigreen>{order_result['data']['order_quantity']}</ansigreen>"
+                f" at <ansigreen>{mark_price}</ansigreen>"
             )
-        return success
-
-    elif dex == "hyperliquid":
-        order_result = hyperliquid_order.create_market_order(symbol, quantity, side)
-        success = order_result.get("status") == "ok"
-        if success:
-            for status in order_result["response"]["data"]["statuses"]:
-                try:
-                    filled = status["filled"]
-                    print_formatted_text(
-                        f"Hyperliquid order #{filled['oid']} ",
-                        "filled ",
-                        HTML(f"<ansigreen>{filled['totalSz']}</ansigreen>"),
-                        " at ",
-                        HTML(f"<ansigreen>{filled['avgPx']}</ansigreen>"),
+        )
+    return success
+
+
+def _order_on_hyperliquid(symbol: str, quantity: float, side: Side) -> bool:
+    order_result = hyperliquid_order.create_market_order(symbol, quantity, side)
+    success = order_result.get("status") == "ok"
+    if success:
+        for status in order_result["response"]["data"]["statuses"]:
+            try:
+                filled = status["filled"]
+                print_formatted_text(
+                    HTML(
+                        f"Hyperliquid order #{filled['oid']} filled "
+                        f"<ansigreen>{filled['totalSz']}</ansigreen>"
+                        f" at <ansigreen>{filled['avgPx']}</ansigreen>"
                     )
-                except KeyError:
-                    print(f"Error: {status.get('error')}")
-                    return False
-        return success
+                )
+            except KeyError:
+                print(f"Error: {status.get('error')}")
+                return False
+    return success
 
-    # * elif ADD NEW DEX HERE
 
-    print(f"Unsupported DEX: {dex}")
-    return False
+# * ADD NEW DEX HERE
+ORDER_HANDLERS = {
+    "orderly": _order_on_orderly,
+    "hyperliquid": _order_on_hyperliquid,
+}
+
+
+def create_order(dex: str, symbol: str, quantity: float, side: Side):
+    """Создать маркет-ордер на любом поддерживаемом DEX."""
+    handler = ORDER_HANDLERS.get(dex)
+    if handler is None:
+        return _unsupported_dex(dex)
+    return handler(symbol, quantity, side)
+
+
+async def _execute_arbitrage_legs(
+    symbol: str, short_on_dex: str, long_on_dex: str, order_quantity: float
+):
+    """Отправить обе ноги (short и long) одновременно через asyncio.gather."""
+    return await asyncio.gather(
+        asyncio.to_thread(
+            create_order, short_on_dex, symbol, order_quantity, Side.SELL
+        ),
+        asyncio.to_thread(
+            create_order, long_on_dex, symbol, order_quantity, Side.BUY
+        ),
+        return_exceptions=True,
+    )
 
 
 def execute_funding_rate_arbitrage(
@@ -188,53 +318,90 @@ def execute_funding_rate_arbitrage(
     """
     Short на бирже с более высоким funding,
     Long на бирже с более низким funding.
+
+    Обе ноги отправляются параллельно: биржи независимы, а рассинхрон
+    между ногами — главный источник слиппеджа. Если заполнилась только
+    одна нога, закрываем её компенсирующим маркет-ордером.
     """
 
-    # Сначала шорт
-    if not create_order(short_on_dex, symbol, order_quantity, Side.SELL):
-        print(f"{short_on_dex.title()} order failed, aborting strategy")
-        return False
+    short_result, long_result = asyncio.run(
+        _execute_arbitrage_legs(symbol, short_on_dex, long_on_dex, order_quantity)
+    )
+    short_ok = short_result is True
+    long_ok = long_result is True
+
+    if short_ok and long_ok:
+        return True
+
+    if short_ok and not long_ok:
+        print(f"{long_on_dex.title()} order failed, unwinding the short leg")
+        if not market_close_an_asset(short_on_dex, symbol):
+            print("Close the short position manually or via menu!")
+    elif long_ok and not short_ok:
+        print(f"{short_on_dex.title()} order failed, unwinding the long leg")
+        if not market_close_an_asset(long_on_dex, symbol):
+            print("Close the long position manually or via menu!")
+    else:
+        print("Both orders failed, aborting strategy")
+
+    return False
+
+
+def _positions_on_orderly() -> list:
+    print("Orderly Positions:")
+    return client.order.get_all_positions()
+
+
+def _positions_on_hyperliquid() -> list:
+    print("Hyperliquid Positions:")
+    return hyperliquid_order.get_open_positions()
 
-    # Потом лонг
-    if not create_order(long_on_dex, symbol, order_quantity, Side.BUY):
-        print(f"{long_on_dex.title()} order failed, aborting strategy")
-        print("Close the short position manually or via menu!")
-        return False
 
-    return True
+# * ADD NEW DEX HERE
+POSITION_HANDLERS = {
+    "orderly": _positions_on_orderly,
+    "hyperliquid": _positions_on_hyperliquid,
+}
 
 
 def print_open_positions(dex: str):
     """Вывести открытые позиции по выбранному DEX."""
-    if dex == "orderly":
-        print("Orderly Positions:")
-        positions = client.order.get_all_positions()
-    elif dex == "hyperliquid":
-        print("Hyperliquid Positions:")
-        positions = hyperliquid_order.get_open_positions()
-    else:
-        positions = []
+    handler = POSITION_HANDLERS.get(dex)
+    positions = handler() if handler is not None else []
 
+    # Собираем весь список в одну HTML-строку: один парс разметки и один
+    # flush stdout вместо пары вызовов на каждую позицию
+    lines = []
     for position in positions:
         symbol = position["symbol"]
         size = float(position["position_size"])
-        if size > 0:
-            print_formatted_text(
-                f"     {symbol}: ", HTML(f"<ansigreen>{size}</ansigreen>")
-            )
-        else:
-            print_formatted_text(
-                f"     {symbol}: ", HTML(f"<ansired>{size}</ansired>")
-            )
+        color = "ansigreen" if size > 0 else "ansired"
+        lines.append(f"     {symbol}: <{color}>{size}</{color}>")
+
+    if lines:
+        print_formatted_text(HTML("\n".join(lines)))
+
+
+def _cancel_on_orderly():
+    client.order.cancel_all_orders()
+
+
+def _cancel_on_hyperliquid():
+    hyperliquid_order.cancel_open_orders()
+
+
+# * ADD NEW DEX HERE
+CANCEL_HANDLERS = {
+    "orderly": _cancel_on_orderly,
+    "hyperliquid": _cancel_on_hyperliquid,
+}
 
 
 def cancel_open_orders(dex: str):
     """Отменить все открытые ордера на выбранном DEX."""
-    if dex == "orderly":
-        client.order.cancel_all_orders()
-    elif dex == "hyperliquid":
-        hyperliquid_order.cancel_open_orders()
-    # * elif ADD NEW DEX HERE
+    handler = CANCEL_HANDLERS.get(dex)
+    if handler is not None:
+        handler()
 
 
 def print_available_USDC_per_DEX(label: str, amount: float):
@@ -247,8 +414,7 @@ def print_available_USDC_per_DEX(label: str, amount: float):
         formatted_amount = f"{amount:,.2f}"
 
     print_formatted_text(
-        label,
-        HTML(f" <ansigreen>{formatted_amount} USDC available</ansigreen>"),
+        HTML(f"{label} <ansigreen>{formatted_amount} USDC available</ansigreen>")
     )
 
 
@@ -302,6 +468,9 @@ if __name__ == "__main__":
         hl_base_url, skip_ws=True
     )
     hyperliquid_order = HyperLiquidOrder(hl_address, hl_info, hl_exchange)
+    # Один клиент на весь сеанс — иначе его TTL-кэш ставок никогда не живёт
+    # дольше одного вызова
+    hyperliquid_public = HyperliquidFundingRates(hl_address, hl_info, hl_exchange)
     print(f"Connected to Hyperliquid ({'mainnet' if IS_MAINNET else 'testnet'})")
 
     # ---------- MAIN LOOP ----------
@@ -310,22 +479,7 @@ if __name__ == "__main__":
         clear_screen()
         print_ascii_art()
 
-        # доступные DEX
-        dex_options = [
-            "orderly",
-            "hyperliquid",
-            # *** ADD NEW DEX HERE ***
-        ]
-
-        main_options = [
-            "View USDC balances on each DEX",  # 1
-            "View open positions",             # 2
-            "Close positions",                 # 3
-            "Cancel open orders",              # 4
-            "Funding rate arbitrage tools",    # 5
-            "Exit",                            # 6
-        ]
-        choice = prompt_user(main_options, "What would you like to do?\n")
+        choice = prompt_user(MAIN_OPTIONS, "What would you like to do?\n")
 
         # ----- 1. Balances -----
         if choice == 1:
@@ -355,25 +509,23 @@ if __name__ == "__main__":
                 "Hyperliquid balance", hyperliquid_amount
             )
 
-            back_options = ["Back to Main Menu"]
-            _ = prompt_user(back_options, "")
+            _ = prompt_user(BACK_OPTIONS, "")
             continue
 
         # ----- 2. Open positions -----
         elif choice == 2:
             print("\n")
-            for dex in dex_options:
+            for dex in DEX_OPTIONS:
                 print_open_positions(dex)
                 print("\n")
 
-            back_options = ["Back to Main Menu"]
-            _ = prompt_user(back_options, "")
+            _ = prompt_user(BACK_OPTIONS, "")
             continue
 
         # ----- 3. Close positions -----
         elif choice == 3:
             dex_choice = prompt_user(
-                dex_options, "\nWhat DEX would you like to close positions on?"
+                DEX_OPTIONS, "\nWhat DEX would you like to close positions on?"
             )
             close_on_dex = get_dex_from_dex_options(dex_choice)
             if not close_on_dex:
@@ -396,15 +548,13 @@ if __name__ == "__main__":
                     f"Manual intervention may be required."
                 )
 
-            back_options = ["Back to Main Menu"]
-            _ = prompt_user(back_options, "")
+            _ = prompt_user(BACK_OPTIONS, "")
             continue
 
         # ----- 4. Cancel open orders -----
         elif choice == 4:
             while True:
-                local_dex_options = dex_options.copy()
-                local_dex_options.append("Back to Main Menu")
+                local_dex_options = (*DEX_OPTIONS, "Back to Main Menu")
 
                 dex_choice = prompt_user(
                     local_dex_options,
@@ -430,14 +580,10 @@ if __name__ == "__main__":
 
         # ----- 5. Funding Rate Arbitrage Tools -----
         elif choice == 5:
+            # Прогреваем кэш ставок, пока пользователь выбирает пункт
+            _prefetch_rates_df()
             while True:
-                fr_options = [
-                    "View rates on all available DEXs",
-                    "View top 3 rate differences from all DEXs",
-                    "Execute Strategy",
-                    "Back to Main Menu",
-                ]
-                sub_choice = prompt_user(fr_options, "\nWhat would you like to do?")
+                sub_choice = prompt_user(FR_OPTIONS, "\nWhat would you like to do?")
 
                 # View all rates
                 if sub_choice == 1:
@@ -457,10 +603,8 @@ if __name__ == "__main__":
                     )
                     symbol = input("Symbol: ").upper()
 
-                    local_dex_options = dex_options.copy()
-
                     short_choice = prompt_user(
-                        local_dex_options, "What DEX would you like to short on?"
+                        DEX_OPTIONS, "What DEX would you like to short on?"
                     )
                     short_on_dex = get_dex_from_dex_options(short_choice)
                     if not short_on_dex:
@@ -469,7 +613,7 @@ if __name__ == "__main__":
                         break
 
                     remaining_dex = [
-                        d for d in local_dex_options if d != short_on_dex
+                        d for d in DEX_OPTIONS if d != short_on_dex
                     ]
 
                     long_choice = prompt_user(
@@ -503,9 +647,8 @@ if __name__ == "__main__":
                     )
                     print(f"Order Quantity: {order_quantity}")
 
-                    confirm_options = ["Yes", "No"]
                     confirm_choice = prompt_user(
-                        confirm_options, "Are you sure this is correct?"
+                        CONFIRM_OPTIONS, "Are you sure this is correct?"
                     )
                     if confirm_choice == 1:
                         print("Okay! Let's arbitrage!")
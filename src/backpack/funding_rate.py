@@ -1,7 +1,31 @@
 import logging
+import os
+import time
 from typing import Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    # C-implemented parser, noticeably faster on multi-hundred-symbol payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    # Optional: stream-parse the markPrices array instead of materializing
+    # the whole payload as a list of dicts first
+    import ijson
+except ImportError:
+    ijson = None
+
+# Shared session: keeps the TCP+TLS connection alive between calls, so only
+# the first request pays the handshake cost.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=8, pool_maxsize=16),
+)
 
 
 class BackpackFundingRates:
@@ -22,19 +46,34 @@ class BackpackFundingRates:
     def __init__(self, base_url: Optional[str] = None) -> None:
         self.base_url = base_url or self.BASE_URL
 
+        # Funding rates change on an 8h cadence, so a short TTL cache saves
+        # a full HTTPS round trip on back-to-back menu views.
+        self._cache: Optional[Dict[str, float]] = None
+        self._cache_ts: float = 0.0
+        self._ttl: float = float(os.getenv("BACKPACK_FR_TTL", "60"))
+
     def get_backpack_funding_rates(self) -> Dict[str, float]:
         """
         Fetches funding rates for all perpetual markets on Backpack.
 
+        Results are cached for `BACKPACK_FR_TTL` seconds (60 by default);
+        error/empty responses are never cached.
+
         Returns:
             dict: { symbol_without_suffix: funding_rate_float }
                   e.g. {"BTC_USDC": 0.0001, ...}
         """
+        if (
+            self._cache is not None
+            and time.monotonic() - self._cache_ts < self._ttl
+        ):
+            return self._cache
+
         url = f"{self.base_url}/api/v1/markPrices"
 
         try:
-            resp = requests.get(url, timeout=5)
-        except Exception as e:
+            resp = _SESSION.get(url, timeout=5, stream=ijson is not None)
+        except requests.exceptions.RequestException as e:
             logging.error("Backpack markPrices request failed: %s", e)
             return {}
 
@@ -46,33 +85,66 @@ class BackpackFundingRates:
             )
             return {}
 
-        try:
-            data = resp.json()
-        except Exception as e:
-            logging.error("Backpack markPrices JSON decode failed: %s; text=%r", e, resp.text[:300])
+        # Validate the content type up front instead of letting the JSON
+        # decoder raise on an HTML error page
+        content_type = resp.headers.get("content-type", "")
+        if not content_type.startswith("application/json"):
+            logging.error(
+                "Backpack markPrices returned non-JSON content type: %r",
+                content_type,
+            )
             return {}
 
-        if not isinstance(data, list):
-            logging.error("Backpack markPrices returned unexpected payload: %r", data)
-            return {}
+        if ijson is not None:
+            # Stream items off the wire one at a time: only symbol and
+            # fundingRate are kept, the full list of dicts is never built
+            resp.raw.decode_content = True
+            try:
+                rates = self._parse_rates(ijson.items(resp.raw, "item"))
+            except (ijson.JSONError, OSError) as e:
+                logging.error("Backpack markPrices stream parse failed: %s", e)
+                return {}
+        else:
+            try:
+                # Decode straight from bytes: skips the .text utf-8 re-encode
+                data = _json_loads(resp.content)
+            except ValueError as e:
+                logging.error("Backpack markPrices JSON decode failed: %s; text=%r", e, resp.text[:300])
+                return {}
+
+            if not isinstance(data, list):
+                logging.error("Backpack markPrices returned unexpected payload: %r", data)
+                return {}
 
+            rates = self._parse_rates(data)
+
+        if rates:
+            self._cache = rates
+            self._cache_ts = time.monotonic()
+
+        return rates
+
+    @staticmethod
+    def _parse_rates(items) -> Dict[str, float]:
+        """Build {symbol: funding_rate} from an iterable of markPrices items."""
         rates: Dict[str, float] = {}
-        for item in data:
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+
+            symbol = item.get("symbol")
+            fr_str = item.get("fundingRate")
+            if not isinstance(symbol, str) or fr_str is None:
+                continue
+
+            # Convert "BTC_USDC_PERP" -> "BTC_USDC" for consistency with
+            # other DEXes; removesuffix scans once and returns the original
+            # object unchanged (no allocation) when there is no suffix
+            symbol_key = symbol.removesuffix("_PERP")
+
             try:
-                symbol = item.get("symbol")
-                fr_str = item.get("fundingRate")
-                if symbol is None or fr_str is None:
-                    continue
-
-                # Convert "BTC_USDC_PERP" -> "BTC_USDC" for consistency with other DEXes
-                if symbol.endswith("_PERP"):
-                    symbol_key = symbol.replace("_PERP", "")
-                else:
-                    symbol_key = symbol
-
-                fr_val = float(fr_str)
-                rates[symbol_key] = fr_val
-            except Exception:
+                rates[symbol_key] = float(fr_str)
+            except (TypeError, ValueError):
                 # Skip malformed entries, but don't break the whole function
                 continue
 
@@ -1,5 +1,6 @@
 from hyperliquid.utils import constants
 import hyperliq.hyperliq_utils as hyperliq_utils
+import os
 import time
 
 
@@ -15,6 +16,11 @@ class HyperliquidFundingRates(object):
         self.info = info
         self.exchange = exchange
 
+        # Short TTL cache so repeated menu views reuse one API response
+        self._cache = None
+        self._cache_ts = 0.0
+        self._ttl = float(os.getenv("HYPERLIQUID_FR_TTL", "60"))
+
     def get_funding_history(self, symbol: str) -> int:
         """
         Retrieves the funding history for a given symbol over the last 30 minutes.
@@ -37,6 +43,11 @@ class HyperliquidFundingRates(object):
         Returns:
         dict: a dictionary where the symbol is the key and the funding rate is the value
         """
+        if (
+            self._cache is not None
+            and time.monotonic() - self._cache_ts < self._ttl
+        ):
+            return self._cache
 
         # Get meta data for all assets
         meta_data = hyperliq_utils.get_meta_data()
@@ -56,4 +67,9 @@ class HyperliquidFundingRates(object):
             )  # convert to 8hr rate from 1hr rate
             assets_to_funding_rates[symbol] = funding_rate
 
+        # Don't cache an empty dict — an API hiccup shouldn't stick for a TTL
+        if assets_to_funding_rates:
+            self._cache = assets_to_funding_rates
+            self._cache_ts = time.monotonic()
+
         return assets_to_funding_rates
@@ -10,6 +10,7 @@ except ImportError:
 from hyperliquid.utils import constants
 import hyperliq_utils as hyperliq_utils
 import json
+import time
 
 
 class Side(StrEnum):
@@ -29,12 +30,46 @@ class HyperLiquidOrder(object):
         self.info = info
         self.exchange = exchange
 
+        # Universe changes rarely; a ~2s TTL lets back-to-back order ops
+        # (e.g. close -> market order) share one metaAndAssetCtxs fetch.
+        self._universe_cache = None
+        self._universe_ts = 0.0
+        self._universe_ttl = 2.0
+        self._symbol_index = {}
+
+    def _get_universe(self):
+        """
+        Return the (cached) asset universe list.
+
+        Refreshes via `info.meta_and_asset_ctxs()` when the TTL expires and
+        rebuilds `self._symbol_index` ({name: asset}) so symbol lookups are
+        O(1) dict hits instead of linear scans.
+        """
+        now = time.monotonic()
+        if (
+            self._universe_cache is None
+            or now - self._universe_ts >= self._universe_ttl
+        ):
+            meta_and_asset_ctxs = self.info.meta_and_asset_ctxs()
+            self._universe_cache = meta_and_asset_ctxs[1]["universe"]
+            self._symbol_index = {
+                asset["name"]: asset for asset in self._universe_cache
+            }
+            self._universe_ts = now
+        return self._universe_cache
+
+    def _get_symbol_info(self, symbol: str):
+        """Look up an asset by name in the cached universe (O(1))."""
+        self._get_universe()
+        return self._symbol_index.get(symbol)
+
     def create_market_order(
         self,
         symbol: str,
         sz_usd: float,
         side: Side,
         slippage: float = 0.2,
+        user_state=None,
     ):
         """
         Create a market order.
@@ -44,32 +79,39 @@ class HyperLiquidOrder(object):
         sz_usd (float): The size of the order in USD.
         side (Side): The side of the trade (BUY or SELL).
         slippage (float): Slippage tolerance factor.
+        user_state (dict): Optional pre-fetched user state; callers that
+            already hold a fresh snapshot (e.g. market_close_an_asset)
+            pass it down to avoid a second HTTPS round trip.
 
         Returns:
         dict: The response from the Hyperliquid API after placing the order.
         """
-        meta_and_asset_ctxs = self.info.meta_and_asset_ctxs()
-        universe = meta_and_asset_ctxs[1]["universe"]
-
-        symbol_info = next((asset for asset in universe if asset["name"] == symbol), None)
+        symbol_info = self._get_symbol_info(symbol)
         if symbol_info is None:
             raise ValueError(f"Symbol '{symbol}' not found in the Hyperliquid universe.")
 
         px = float(symbol_info["markPx"])
-        max_px = round(px * (1 + slippage), 8)
-        min_px = round(px * (1 - slippage), 8)
+
+        # Hoist the enum accesses: one .value descriptor lookup and one
+        # plain string compare for the whole call
+        side_str = side.value
+        is_buy = side_str == "BUY"
+
+        # Only the bound on the trade's own side matters: price up for
+        # buys, down for sells — one round() instead of two
+        limit_px = round(px * (1 + slippage if is_buy else 1 - slippage), 8)
 
         sz = sz_usd / px
 
         order_spec = hyperliq_utils.get_market_open_order(
             symbol,
             sz,
-            side.value,
-            {"limitPx": max_px if side == Side.BUY else min_px},
-        )
-        hyperliq_utils.check_order_leverage(
-            self.info.user_state(self.address), symbol, sz, side.value
+            side_str,
+            {"limitPx": limit_px},
         )
+        if user_state is None:
+            user_state = self.info.user_state(self.address)
+        hyperliq_utils.check_order_leverage(user_state, symbol, sz, side_str)
         order_result = self.exchange.order(order_spec, {"gasPrice": "0"})
 
         # print out the status of the order
@@ -108,14 +150,16 @@ class HyperLiquidOrder(object):
         px = limit_px
         sz = sz_usd / px
 
+        side_str = side.value
+
         order_spec = hyperliq_utils.get_limit_open_order(
             symbol,
             sz,
-            side.value,
+            side_str,
             limit_px,
         )
         hyperliq_utils.check_order_leverage(
-            self.info.user_state(self.address), symbol, sz, side.value
+            self.info.user_state(self.address), symbol, sz, side_str
         )
         order_result = self.exchange.order(order_spec, {"gasPrice": "0"})
 
@@ -160,23 +204,19 @@ class HyperLiquidOrder(object):
         """
         user_state = self.info.user_state(self.address)
         asset_positions = user_state["assetPositions"]
-        asset_ctx = self.info.meta_and_asset_ctxs()[1]
-        universe = asset_ctx["universe"]
 
-        symbol_info = next((asset for asset in universe if asset["name"] == symbol), None)
+        symbol_info = self._get_symbol_info(symbol)
         if symbol_info is None:
             raise ValueError(f"Symbol '{symbol}' not found in the Hyperliquid universe.")
 
         coin_index = symbol_info["index"]
 
-        position = next(
-            (
-                position
-                for position in asset_positions
-                if position["position"]["coin"] == coin_index
-            ),
-            None,
-        )
+        # Index positions by coin once instead of a linear next() scan
+        coin_to_pos = {
+            position["position"]["coin"]: position
+            for position in asset_positions
+        }
+        position = coin_to_pos.get(coin_index)
 
         if position:
             size = float(position["position"]["szi"])
@@ -184,7 +224,14 @@ class HyperLiquidOrder(object):
             print(
                 f"Closing {symbol} position of size {size} on Hyperliquid, side: {side.value}"
             )
-            self.create_market_order(symbol, abs(size) * float(symbol_info["markPx"]), side)
+            # Reuse the user_state snapshot fetched above for the leverage
+            # check inside create_market_order
+            self.create_market_order(
+                symbol,
+                abs(size) * float(symbol_info["markPx"]),
+                side,
+                user_state=user_state,
+            )
             return True
 
         print(f"No open position for {symbol} on Hyperliquid")
@@ -199,16 +246,16 @@ class HyperLiquidOrder(object):
         """
         # Get the user state and print out position information
         user_state = self.info.user_state(self.address)
-        filtered_positions = []
-        for position in user_state["assetPositions"]:
-            symbol = position["position"]["coin"]
-            position_size = float(position["position"]["szi"])
-            if position_size != 0:
-                filtered_positions.append(
-                    {"symbol": symbol, "position_size": position_size}
-                )
-
-        if len(filtered_positions) == 0:
+        # Single comprehension; the inner one-element for binds the float
+        # cast to a name so it is computed once and filtered by truthiness
+        filtered_positions = [
+            {"symbol": position["position"]["coin"], "position_size": size}
+            for position in user_state["assetPositions"]
+            for size in (float(position["position"]["szi"]),)
+            if size
+        ]
+
+        if not filtered_positions:
             print("     No open positions")
 
         return filtered_positions
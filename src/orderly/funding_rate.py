@@ -1,12 +1,145 @@
+import asyncio
+import functools
 import logging
 import os
+import re
+import threading
+import time
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Optional: enables truly concurrent fetches across DEXes; without it
+    # the async entry point falls back to a worker thread
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    # C-implemented parser; decodes response bytes directly
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+try:
+    # Optional: stream funding-rate rows off the wire instead of
+    # materializing the whole payload first
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
 
+class _RateLimiter:
+    """Token-bucket limiter shared by the Orderly REST callers.
+
+    Orderly enforces per-IP rate limits; a 429 serializes everything
+    behind its Retry-After, which costs far more than pacing ourselves
+    just under the limit. The bucket also adapts reactively from
+    `retry-after` / `x-ratelimit-remaining` response headers.
+    """
+
+    def __init__(self, rate: float = 8.0, burst: Optional[float] = None) -> None:
+        self.rate = rate  # tokens (requests) per second
+        self.burst = burst if burst is not None else rate
+        self._tokens = self.burst
+        self._last_ts = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait_if_throttled(self) -> None:
+        """Block until a request is allowed, consuming one token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    self._tokens = min(
+                        self.burst,
+                        self._tokens + (now - self._last_ts) * self.rate,
+                    )
+                    self._last_ts = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def update_from_response(self, resp) -> None:
+        """Adapt the bucket from rate-limit headers on a response."""
+        headers = getattr(resp, "headers", None)
+        if not headers:
+            return
+
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = 0.0
+            if delay > 0:
+                with self._lock:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + delay
+                    )
+
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None:
+            try:
+                remaining_tokens = float(remaining)
+            except (TypeError, ValueError):
+                return
+            with self._lock:
+                self._tokens = min(self._tokens, remaining_tokens)
+
+
+# One shared bucket per process: the limit is per IP, not per client object
+_RATE_LIMITER = _RateLimiter(rate=float(os.getenv("ORDERLY_RPS", "8")))
+
+
+# Keys under which the funding-rate rows may live in the payload,
+# in order of preference (built once, not per response)
+_ROW_KEYS = ("data", "rows", "funding_rates", "result")
+
+
+# One pass over the symbol instead of a chain of startswith/endswith
+# calls: optional PERP prefix, the base ticker, then optional quote
+# currency and perp-marker suffixes.
+_SYMBOL_RE = re.compile(
+    r"^(?:PERP[_-])?(.+?)(?:[_-](?:USDC|USDT))?(?:[_-]PERP)?$"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_symbol(symbol: str) -> Optional[str]:
+    """Convert Orderly symbol to a generic underlying symbol.
+
+    Examples:
+        PERP_ETH_USDC -> ETH
+        PERP_BTC_USDT -> BTC
+        ETH-PERP -> ETH
+
+    The symbol universe is small and stable, so the result is memoized:
+    after the first poll each lookup is a single cache hit.
+    """
+    if not symbol:
+        return None
+
+    m = _SYMBOL_RE.match(symbol.upper())
+    if not m:
+        return None
+
+    s = m.group(1).strip("_- ")
+    if not s:
+        return None
+    return s
+
+
 class OrderlyFundingRates:
     """Fetch and normalize funding rates from Orderly.
 
@@ -19,7 +152,9 @@ class OrderlyFundingRates:
     where keys are the underlying symbols (without PERP/USDC suffixes).
     """
 
-    def __init__(self, env: Optional[str] = None) -> None:
+    def __init__(
+        self, env: Optional[str] = None, cache_ttl: Optional[float] = None
+    ) -> None:
         # Detect environment: "testnet" (default) vs "mainnet"
         env_from_os = (env or os.getenv("ORDERLY_ENV", "testnet")).lower()
         if env_from_os not in ("testnet", "mainnet"):
@@ -33,6 +168,48 @@ class OrderlyFundingRates:
             # Testnet REST base
             self.base_url = "https://testnet-api-evm.orderly.org"
 
+        # Short TTL cache: funding rates move slowly, so back-to-back calls
+        # within the TTL reuse the previous (non-empty) result. The TTL
+        # comes from the `cache_ttl` argument when given, otherwise from
+        # the ORDERLY_FR_TTL env var (60s by default).
+        self._cache: Optional[Dict[str, float]] = None
+        self._cache_ts: float = 0.0
+        if cache_ttl is not None:
+            self._ttl = float(cache_ttl)
+        else:
+            self._ttl = float(os.getenv("ORDERLY_FR_TTL", "60"))
+
+        # Separate cache for the bulk mark-price snapshot (see
+        # get_all_mark_prices); mark prices move faster than funding
+        # rates, hence the shorter default TTL.
+        self._mark_price_cache: Optional[Dict[str, float]] = None
+        self._mark_price_ts: float = 0.0
+        self._mark_price_ttl: float = float(os.getenv("ORDERLY_MP_TTL", "30"))
+
+        # Persistent session: keeps the TLS connection alive between
+        # polls and retries transient 429/5xx responses with backoff.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+            ),
+        )
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        self._session.close()
+
+    def __enter__(self) -> "OrderlyFundingRates":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -43,6 +220,11 @@ class OrderlyFundingRates:
         an empty dict is returned and the caller can treat Orderly as
         "no data" for this run.
         """
+        if (
+            self._cache is not None
+            and time.monotonic() - self._cache_ts < self._ttl
+        ):
+            return self._cache
 
         try:
             raw_items = self._request_funding_rates()
@@ -50,7 +232,39 @@ class OrderlyFundingRates:
             logger.error("Failed to fetch Orderly funding rates: %s", exc)
             return {}
 
-        result: Dict[str, float] = {}
+        return self._rows_to_rates(raw_items)
+
+    async def get_orderly_funding_rates_async(
+        self, session: Optional["aiohttp.ClientSession"] = None
+    ) -> Dict[str, float]:
+        """Async counterpart of :meth:`get_orderly_funding_rates`.
+
+        Designed for fetching several DEXes concurrently via
+        ``asyncio.gather``. Uses ``aiohttp`` when installed (pass a shared
+        ``ClientSession`` to reuse its connection pool across venues);
+        without aiohttp the sync path runs in a worker thread instead.
+        """
+        if (
+            self._cache is not None
+            and time.monotonic() - self._cache_ts < self._ttl
+        ):
+            return self._cache
+
+        if aiohttp is None:
+            return await asyncio.to_thread(self.get_orderly_funding_rates)
+
+        try:
+            raw_items = await self._request_funding_rates_async(session)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.error("Failed to fetch Orderly funding rates: %s", exc)
+            return {}
+
+        return self._rows_to_rates(raw_items)
+
+    def _rows_to_rates(self, raw_items: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Convert raw API rows to {underlying -> rate}, updating the cache."""
+        # First pass: collect (underlying, raw_rate) pairs without parsing
+        pairs = []
         for row in raw_items:
             symbol_raw = self._extract_symbol(row)
             if not symbol_raw:
@@ -60,12 +274,85 @@ class OrderlyFundingRates:
             if not underlying:
                 continue
 
-            rate = self._extract_rate(row)
-            if rate is None:
+            raw_rate = self._extract_rate_raw(row)
+            if raw_rate is None:
                 continue
 
             # underlying типа "ETH", "BTC", "SOL" и т.п.
-            result[underlying] = rate
+            pairs.append((underlying, raw_rate))
+
+        if not pairs:
+            return {}
+
+        # Second pass: parse every rate in one C-vectorized numpy call;
+        # a malformed value anywhere drops us back to per-row parsing
+        result: Dict[str, float]
+        try:
+            values = np.asarray([raw for _, raw in pairs], dtype=np.float64)
+        except (TypeError, ValueError):
+            result = {}
+            for underlying, raw in pairs:
+                try:
+                    result[underlying] = float(raw)
+                except (TypeError, ValueError):
+                    continue
+        else:
+            result = dict(zip((u for u, _ in pairs), values.tolist()))
+
+        # An error/empty run should not be served from cache for a whole TTL
+        if result:
+            self._cache = result
+            self._cache_ts = time.monotonic()
+
+        return result
+
+    def get_all_mark_prices(self) -> Dict[str, float]:
+        """Return current mark prices as {orderly_symbol -> mark_price}.
+
+        Uses the bulk `/v1/public/futures` endpoint, so one round trip
+        covers every market (keys keep the full Orderly form, e.g.
+        "PERP_ETH_USDC"). Results are cached for `ORDERLY_MP_TTL` seconds
+        (30 by default); errors return an empty dict and are not cached.
+        """
+        if (
+            self._mark_price_cache is not None
+            and time.monotonic() - self._mark_price_ts < self._mark_price_ttl
+        ):
+            return self._mark_price_cache
+
+        url = f"{self.base_url}/v1/public/futures"
+        _RATE_LIMITER.wait_if_throttled()
+        try:
+            resp = self._session.get(url, timeout=(3, 10))
+            _RATE_LIMITER.update_from_response(resp)
+            resp.raise_for_status()
+            payload = _json_loads(resp.content)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.error("Failed to fetch Orderly mark prices: %s", exc)
+            return {}
+
+        rows: List[Dict[str, Any]] = []
+        if isinstance(payload, dict):
+            data = payload.get("data")
+            if isinstance(data, dict) and isinstance(data.get("rows"), list):
+                rows = [r for r in data["rows"] if isinstance(r, dict)]
+            elif isinstance(data, list):
+                rows = [r for r in data if isinstance(r, dict)]
+
+        result: Dict[str, float] = {}
+        for row in rows:
+            symbol = row.get("symbol")
+            raw = row.get("mark_price")
+            if not isinstance(symbol, str) or raw is None:
+                continue
+            try:
+                result[symbol] = float(raw)
+            except (TypeError, ValueError):
+                continue
+
+        if result:
+            self._mark_price_cache = result
+            self._mark_price_ts = time.monotonic()
 
         return result
 
@@ -96,22 +383,147 @@ class OrderlyFundingRates:
         We try to be tolerant to small schema changes.
         """
         url = f"{self.base_url}/v1/public/funding_rates"
-        resp = requests.get(url, timeout=10)
+
+        _RATE_LIMITER.wait_if_throttled()
+
+        if ijson is not None:
+            # Stream rows while bytes are still arriving: memory stays at
+            # one row instead of the whole decoded payload
+            resp = self._session.get(url, timeout=(3, 10), stream=True)
+            _RATE_LIMITER.update_from_response(resp)
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            return self._stream_rows(resp.raw)
+
+        resp = self._session.get(url, timeout=(3, 10))
+        _RATE_LIMITER.update_from_response(resp)
         resp.raise_for_status()
-        payload = resp.json()
+        payload = _json_loads(resp.content)
+        return self._extract_rows(payload)
+
+    @staticmethod
+    def _stream_rows(stream) -> List[Dict[str, Any]]:
+        """Incrementally collect row dicts from the response stream.
+
+        Applies the same shape preferences as `_extract_rows` — a bare
+        top-level list first, then the first `_ROW_KEYS` key holding a
+        list, then the single-row {"symbol": ...} fallback — so the
+        streamed sync path and the buffered/async paths agree on what
+        counts as rows.
+        """
+        # Row prefix -> the key it sits under ("" = bare top-level list),
+        # in the same preference order as `_extract_rows`
+        wanted = {"item": ""}
+        wanted.update({f"{key}.item": key for key in _ROW_KEYS})
+
+        seen_arrays: set = set()
+        rows_by_prefix: Dict[str, List[Dict[str, Any]]] = {}
+        builder = None
+        capture_prefix = None
+        # Builds the whole top-level dict for the single-row fallback;
+        # dropped the moment the document reveals any array
+        root_builder = None
+
+        for prefix, event, value in ijson.parse(stream):
+            if builder is not None:
+                builder.event(event, value)
+                if event == "end_map" and prefix == capture_prefix:
+                    rows_by_prefix.setdefault(capture_prefix, []).append(
+                        builder.value
+                    )
+                    builder = None
+                continue
+
+            if event == "start_array":
+                if prefix == "" or prefix in _ROW_KEYS:
+                    # Known row container: from here on rows are streamed,
+                    # the single-row fallback can no longer apply
+                    root_builder = None
+                    seen_arrays.add(prefix)
+                elif root_builder is not None:
+                    # Array under an unexpected key — just payload data
+                    root_builder.event(event, value)
+                continue
+
+            if root_builder is not None:
+                root_builder.event(event, value)
+                continue
+
+            if prefix == "" and event == "start_map":
+                root_builder = ijson.ObjectBuilder()
+                root_builder.event(event, value)
+                continue
+
+            # A dict starting directly inside a wanted array => a row
+            if event == "start_map" and prefix in wanted:
+                capture_prefix = prefix
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
 
-        # Try to find the list of rows in a robust way.
-        if isinstance(payload, list):
-            return [row for row in payload if isinstance(row, dict)]
+        # First matching shape wins, even if its array held no dict rows
+        for row_prefix, key in wanted.items():
+            if key in seen_arrays:
+                return rows_by_prefix.get(row_prefix, [])
 
-        if not isinstance(payload, dict):
+        # Fallback: the payload itself *looks* like a single row
+        if root_builder is not None:
+            payload = root_builder.value
+            if type(payload) is dict and "symbol" in payload:
+                return [payload]
+
+        return []
+
+    async def _request_funding_rates_async(
+        self, session: Optional["aiohttp.ClientSession"] = None
+    ) -> List[Dict[str, Any]]:
+        """Async twin of :meth:`_request_funding_rates` (requires aiohttp).
+
+        When no session is passed a short-lived one is created; callers
+        fetching several venues should share one ``ClientSession`` so all
+        requests reuse its connection pool.
+        """
+        url = f"{self.base_url}/v1/public/funding_rates"
+
+        # The bucket is thread-safe but blocking; don't stall the loop
+        await asyncio.to_thread(_RATE_LIMITER.wait_if_throttled)
+
+        owns_session = session is None
+        if owns_session:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=8)
+            )
+        try:
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                _RATE_LIMITER.update_from_response(resp)
+                resp.raise_for_status()
+                payload = await resp.json()
+        finally:
+            if owns_session:
+                await session.close()
+
+        return self._extract_rows(payload)
+
+    @staticmethod
+    def _extract_rows(payload: Any) -> List[Dict[str, Any]]:
+        """Find the list of funding-rate rows in a tolerant way.
+
+        JSON decoding only ever yields exact list/dict instances, so the
+        exact `type(...) is` checks skip isinstance's MRO walk on this
+        hot, per-row path.
+        """
+        if type(payload) is list:
+            return [row for row in payload if type(row) is dict]
+
+        if type(payload) is not dict:
             return []
 
         # Common patterns: {"data": [...]} or {"rows": [...]}
-        for key in ("data", "rows", "funding_rates", "result"):
+        for key in _ROW_KEYS:
             maybe = payload.get(key)
-            if isinstance(maybe, list):
-                return [row for row in maybe if isinstance(row, dict)]
+            if type(maybe) is list:
+                return [row for row in maybe if type(row) is dict]
 
         # Fallback: if payload itself *looks* like a single row
         if "symbol" in payload:
@@ -128,64 +540,36 @@ class OrderlyFundingRates:
 
     @staticmethod
     def _normalize_symbol(symbol: str) -> Optional[str]:
-        """Convert Orderly symbol to a generic underlying symbol.
-
-        Examples:
-            PERP_ETH_USDC -> ETH
-            PERP_BTC_USDT -> BTC
-            ETH-PERP -> ETH
-        """
-        if not symbol:
-            return None
-
-        s = symbol.upper()
-
-        # Common Orderly format: PERP_ETH_USDC / PERP_BTC_USDC
-        if s.startswith("PERP_"):
-            s = s[len("PERP_") :]
-
-        # Strip common quote currencies
-        for suffix in ("_USDC", "_USDT", "-USDC", "-USDT"):
-            if s.endswith(suffix):
-                s = s[: -len(suffix)]
-                break
-
-        # Other style: ETH-PERP, BTC-PERP, etc.
-        for suffix in ("-PERP", "_PERP"):
-            if s.endswith(suffix):
-                s = s[: -len(suffix)]
-                break
-
-        s = s.strip("_- ")
-        if not s:
-            return None
-        return s
+        """Normalize a symbol (thin wrapper over the cached module function)."""
+        return _normalize_symbol(symbol)
 
     @staticmethod
-    def _extract_rate(row: Dict[str, Any]) -> Optional[float]:
-        """Extract a funding rate from a row.
+    def _extract_rate_raw(row: Dict[str, Any]) -> Optional[Any]:
+        """Extract the raw funding-rate value from a row (unparsed).
 
         Different versions of the API have used slightly different
-        field names, so we check several in order of preference.
+        field names, so we check several in order of preference; a
+        present-but-unparseable value (e.g. "n/a") falls through to the
+        next candidate instead of poisoning the row. The returned value
+        is known to parse, so the batched numpy pass in `_rows_to_rates`
+        never degrades to per-row parsing because of it.
         """
-        candidates = [
+        candidates = (
             "est_funding_rate",
             "funding_rate",
             "funding_rate_8h",
             "last_funding_rate",
             "predicted_rate",
-        ]
+        )
 
-        value: Optional[float] = None
         for key in candidates:
             raw = row.get(key)
             if raw is None:
                 continue
             try:
-                # Values are usually strings like "0.0001"
-                value = float(raw)
-                break
+                float(raw)
             except (TypeError, ValueError):
                 continue
+            return raw
 
-        return value
+        return None
@@ -9,12 +9,32 @@ except ImportError:
         """Backport of StrEnum for Python < 3.11."""
         pass
 
+from functools import lru_cache
+
 from eth_account import Account
-import json
 from requests import Request, Session
+from requests.adapters import HTTPAdapter
 from config import Config
 from signer import Signer
 from util import get_orderly_naming_convention
+try:
+    # main.py импортирует этот модуль как orderly.funding_rate; берём тот же
+    # путь, иначе flat-импорт создаёт второй экземпляр модуля — и вместо
+    # одного общего token-bucket на процесс получается два
+    from orderly.funding_rate import _RATE_LIMITER, _normalize_symbol
+except ImportError:
+    from funding_rate import _RATE_LIMITER, _normalize_symbol
+
+try:
+    # C-implemented parser; decodes response bytes directly
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+# Чистая функция над маленькой стабильной вселенной тикеров: после
+# первого вызова каждое имя — один lookup в кэше вместо f-строки
+_orderly_name = lru_cache(maxsize=256)(get_orderly_naming_convention)
 
 
 class Side(StrEnum):
@@ -40,18 +60,34 @@ class Order(object):
         self._signer = signer
         self._account = account
 
+        # Пул соединений: TLS-handshake платим один раз на все ордера
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=4, pool_maxsize=20, pool_block=True),
+        )
+
+        # URL'ы собираем один раз, а не f-строкой на каждый вызов
+        self._order_url = f"{config.base_url}/v1/order"
+        self._orders_url = f"{config.base_url}/v1/orders"
+        self._position_url = f"{config.base_url}/v1/position"
+        self._positions_url = f"{config.base_url}/v1/positions"
+
     def _send_request(self, request: Request):
         """Helper function: подписать запрос и отправить его."""
         req = self._signer.sign_request(request)
+        # Общий token-bucket на процесс: лимит Orderly считается на IP,
+        # дешевле притормозить здесь, чем ловить 429 и ждать Retry-After
+        _RATE_LIMITER.wait_if_throttled()
         res = self._session.send(req)
-        response = json.loads(res.text)
-        return response
+        _RATE_LIMITER.update_from_response(res)
+        # Декодируем сразу из байтов (orjson при наличии), без .text
+        return _json_loads(res.content)
 
     # ---------- BASIC ORDER METHODS ----------
 
     def get_orders(self):
         """Получить список ордеров."""
-        request = Request("GET", f"{self._config.base_url}/v1/orders")
+        request = Request("GET", self._orders_url)
         return self._send_request(request)
 
     def create_market_order(
@@ -67,16 +103,18 @@ class Order(object):
         :param order_quantity: количество (в контрактных единицах)
         :param side: Side.BUY или Side.SELL
         """
-        symbol = get_orderly_naming_convention(symbol)
+        symbol = _orderly_name(symbol)
 
         request = Request(
             "POST",
-            f"{self._config.base_url}/v1/order",
+            self._order_url,
+            # StrEnum уже наследует str — str(...) обёртки были лишними
+            # аллокациями, json-сериализация принимает их как есть
             json={
                 "symbol": symbol,
-                "order_type": str(OrderType.MARKET),
+                "order_type": OrderType.MARKET,
                 "order_quantity": order_quantity,
-                "side": str(side),
+                "side": side,
             },
         )
         return self._send_request(request)
@@ -118,7 +156,7 @@ class Order(object):
         """
         request = Request(
             "DELETE",
-            f"{self._config.base_url}/v1/orders",
+            self._orders_url,
             # Be careful, orders has to be plural here
         )
         return self._send_request(request)
@@ -127,10 +165,10 @@ class Order(object):
         """
         Получить позицию по конкретному символу.
         """
-        symbol = get_orderly_naming_convention(symbol)
+        symbol = _orderly_name(symbol)
         request = Request(
             "GET",
-            f"https://testnet-api-evm.orderly.network/v1/position/{symbol}",
+            f"{self._position_url}/{symbol}",
         )
         return self._send_request(request)
 
@@ -143,25 +181,22 @@ class Order(object):
         """
         request = Request(
             "GET",
-            "https://testnet-api-evm.orderly.network/v1/positions",
+            self._positions_url,
         )
         positions_data = self._send_request(request)
-        filtered_positions = []
-
-        for position in positions_data["data"]["rows"]:
-            # Конвертим формат Orderly (PERP_XXX_USDC) в обычный тикер
-            symbol = position["symbol"].replace("PERP_", "").replace("_USDC", "")
-            position_size = position["position_qty"]
-
-            if position_size != 0:
-                filtered_positions.append(
-                    {
-                        "symbol": symbol,
-                        "position_size": position_size,
-                    }
-                )
-
-        if len(filtered_positions) == 0:
+
+        # Конвертим формат Orderly (PERP_XXX_USDC) в обычный тикер через
+        # кэшированный нормализатор — вместо двух .replace-аллокаций на строку
+        filtered_positions = [
+            {
+                "symbol": _normalize_symbol(position["symbol"]),
+                "position_size": position["position_qty"],
+            }
+            for position in positions_data["data"]["rows"]
+            if position["position_qty"] != 0
+        ]
+
+        if not filtered_positions:
             print("     No open positions")
 
         return filtered_positions
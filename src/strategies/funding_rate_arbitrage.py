@@ -1,6 +1,44 @@
+import functools
+import re
+
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
+# One pass over the symbol instead of a chain of startswith/endswith
+# calls: optional PERP prefix, the base ticker, then optional quote
+# currency and perp-marker suffixes.
+_SYMBOL_RE = re.compile(
+    r"^(?:PERP[_-])?(.+?)(?:[_-](?:USDC|USDT))?(?:[_-]PERP)?$"
+)
+
+# Служебные колонки таблицы ставок (всё остальное — колонки DEX'ов);
+# AbsDiff — внутренняя, в CLI-таблицу не выводится
+_SERVICE_COLS = frozenset(
+    {"Symbol", "MaxRate", "MinRate", "Difference", "AbsDiff"}
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_symbol(symbol: str) -> str:
+    """Normalize symbol names across DEXes.
+
+    Removes common quote currency suffixes and PERP suffixes so that,
+    for example, `BTC_USDC`, `PERP_BTC_USDC` and `BTC-PERP` all map to
+    the same key `BTC`. Hyperliquid already returns bare symbols, so
+    calling this on them is a no-op.
+
+    Pure and called once per row per refresh over a small, stable symbol
+    universe — memoized so repeated polls cost one dict lookup per symbol.
+    """
+
+    if not symbol:
+        return symbol
+
+    s = symbol.upper()
+    m = _SYMBOL_RE.match(s)
+    return m.group(1) if m else s
+
 
 class FundingRateArbitrage:
     """
@@ -14,36 +52,8 @@ class FundingRateArbitrage:
 
     @staticmethod
     def _normalize_symbol(symbol: str) -> str:
-        """Normalize symbol names across DEXes.
-
-        Removes common quote currency suffixes and PERP suffixes so that,
-        for example, `BTC_USDC`, `PERP_BTC_USDC` and `BTC-PERP` all map to
-        the same key `BTC`. Hyperliquid already returns bare symbols, so
-        calling this on them is a no-op.
-        """
-
-        if not symbol:
-            return symbol
-
-        s = symbol.upper()
-
-        # Remove known prefixes
-        if s.startswith("PERP_"):
-            s = s[len("PERP_") :]
-
-        # Strip common quote currencies
-        for suffix in ("_USDC", "_USDT", "-USDC", "-USDT"):
-            if s.endswith(suffix):
-                s = s[: -len(suffix)]
-                break
-
-        # Remove perpetual markers
-        for suffix in ("-PERP", "_PERP"):
-            if s.endswith(suffix):
-                s = s[: -len(suffix)]
-                break
-
-        return s
+        """Normalize a symbol (thin wrapper over the cached module function)."""
+        return _normalize_symbol(symbol)
 
     def add_dex_rates(self, dex_name: str, rates: dict | None) -> None:
         """
@@ -55,13 +65,14 @@ class FundingRateArbitrage:
         if not rates:
             return
 
-        normalized = {}
-        for symbol, rate in rates.items():
-            norm_symbol = self._normalize_symbol(symbol)
-            # Skip empty keys after normalization
-            if not norm_symbol:
-                continue
-            normalized[norm_symbol] = rate
+        # Одна dict-comprehension: CPython заранее подбирает размер таблицы
+        # по подсказке итератора вместо пошаговых вставок с ресайзами;
+        # пустые ключи после нормализации отбрасываются walrus-условием
+        normalized = {
+            norm_symbol: rate
+            for symbol, rate in rates.items()
+            if (norm_symbol := self._normalize_symbol(symbol))
+        }
 
         if not normalized:
             return
@@ -78,13 +89,12 @@ class FundingRateArbitrage:
         if not self.dex_rates:
             return pd.DataFrame()
 
-        frames = []
-        for dex, rates in self.dex_rates.items():
-            # каждый DEX → Series, имя серии = имя DEX
-            s = pd.Series(rates, name=dex)
-            frames.append(s)
-
-        df = pd.concat(frames, axis=1)
+        # Одна аллокация: pandas сам объединяет ключи всех DEX-словарей,
+        # без промежуточных Series и pd.concat
+        df = pd.DataFrame(self.dex_rates)
+        # Запоминаем список DEX-колонок прямо на фрейме, чтобы display-методы
+        # не пересканировали df.columns на каждый вызов
+        df.attrs["dex_cols"] = list(self.dex_rates.keys())
         return df
 
     def create_rates_table(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -98,27 +108,39 @@ class FundingRateArbitrage:
         if df is None or df.empty:
             return pd.DataFrame()
 
-        df = df.copy()
-        # По всем DEX-колонкам (они числовые)
-        df["MaxRate"] = df.max(axis=1, skipna=True)
-        df["MinRate"] = df.min(axis=1, skipna=True)
-        df["Difference"] = df["MaxRate"] - df["MinRate"]
+        # Один проход по матрице значений: фильтр по числу не-NaN ставок,
+        # max и min считаются на одном numpy-массиве вместо четырёх
+        # отдельных pandas-операций с промежуточными объектами
+        arr = df.to_numpy(dtype=np.float64, copy=False)
+        keep = (~np.isnan(arr)).sum(axis=1) >= 2
 
-        df.index.name = "Symbol"
-        df.reset_index(inplace=True)
+        arr = arr[keep]
+        max_rate = np.nanmax(arr, axis=1)
+        min_rate = np.nanmin(arr, axis=1)
 
-        dex_cols = self._dex_columns(df)
-        if dex_cols:
-            non_na_count = df[dex_cols].notna().sum(axis=1)
-            df = df.loc[non_na_count >= 2].reset_index(drop=True)
+        difference = max_rate - min_rate
 
-        return df
+        out = pd.DataFrame(arr, columns=df.columns, index=df.index[keep])
+        out["MaxRate"] = max_rate
+        out["MinRate"] = min_rate
+        out["Difference"] = difference
+        # Прекомпьют для фильтров display-методов (не выводится в CLI)
+        out["AbsDiff"] = np.abs(difference)
+
+        out.index.name = "Symbol"
+        out.reset_index(inplace=True)
+        # df.attrs не переносится конструктором — пробрасываем кэш колонок
+        if "dex_cols" in df.attrs:
+            out.attrs["dex_cols"] = df.attrs["dex_cols"]
+        return out
 
     @staticmethod
     def _dex_columns(df: pd.DataFrame) -> list[str]:
         """Все колонки, которые относятся к DEX'ам (без служебных)."""
-        service_cols = {"Symbol", "MaxRate", "MinRate", "Difference"}
-        return [c for c in df.columns if c not in service_cols]
+        cached = df.attrs.get("dex_cols")
+        if cached:
+            return cached
+        return [c for c in df.columns if c not in _SERVICE_COLS]
 
     def display_rates_table(self, df: pd.DataFrame) -> None:
         """
@@ -167,10 +189,11 @@ class FundingRateArbitrage:
         mask = (
             df["orderly"].notna()          # ставка на Orderly есть
             & (non_na_count >= 2)          # как минимум ещё один DEX
-            & (df["Difference"].abs() > 0) # разница реально не нулевая
+            & (df["AbsDiff"] > 0)          # разница реально не нулевая
         )
 
-        top = df[mask].sort_values("Difference", ascending=False).head(top_n)
+        # Частичная сортировка кучей: O(N log top_n) вместо полного сорта
+        top = df[mask].nlargest(top_n, "Difference")
 
         if top.empty:
             print(
@@ -209,9 +232,10 @@ class FundingRateArbitrage:
 
         non_na_count = df[dex_cols].notna().sum(axis=1)
 
-        mask = (non_na_count >= 2) & (df["Difference"].abs() > 0)
+        mask = (non_na_count >= 2) & (df["AbsDiff"] > 0)
 
-        top = df[mask].sort_values("Difference", ascending=False).head(top_n)
+        # Частичная сортировка кучей: O(N log top_n) вместо полного сорта
+        top = df[mask].nlargest(top_n, "Difference")
 
         if top.empty:
             print(
@@ -236,14 +260,19 @@ class FundingRateArbitrage:
 
         * Replace missing values with a dash instead of NaN/placeholder numbers.
         * Format numeric values to 6 decimal places for consistent columns.
+
+        All numeric columns are formatted in one block operation (NA mask
+        computed once, then a single map + where) instead of a per-cell
+        pd.isna/float() lambda per column. The result is a fresh frame of
+        just the formatted string columns — the numeric source is never
+        copied wholesale.
         """
 
-        display_df = df.copy()
-        for col in display_df.columns:
-            if col == "Symbol":
-                continue
-            display_df[col] = display_df[col].apply(
-                lambda v: "-" if pd.isna(v) else f"{float(v):.6f}"
-            )
+        # AbsDiff — внутренняя служебная колонка, в таблицу не попадает
+        num_cols = [c for c in df.columns if c not in ("Symbol", "AbsDiff")]
+        mask = df[num_cols].notna()
+        display_df = df[num_cols].map("{:.6f}".format).where(mask, "-")
+        if "Symbol" in df.columns:
+            display_df.insert(0, "Symbol", df["Symbol"].to_numpy())
 
         return display_df